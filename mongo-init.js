@@ -7,5 +7,11 @@ db = db.getSiblingDB('rev_analyzer');
 
 db.createCollection('users');
 db.createCollection('products');
+db.users.createIndex({ "user_id": 1 }, { unique: true });
+db.products.createIndex({ "product_id": 1 }, { unique: true });
+db.createCollection('calibration_samples');
+db.calibration_samples.createIndex({ "ensemble": 1, "created_at": -1 });
+// retention: samples older than 90 days are removed
+db.calibration_samples.createIndex({ "created_at": 1 }, { expireAfterSeconds: 7776000 });
 
 print('Database, collections and indexes initialized successfully');
@@ -1,10 +1,21 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from app.endpoints import router
+from services.calibration import start_calibration_scheduler, stop_calibration_scheduler, stop_audits
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_calibration_scheduler()
+    yield
+    stop_calibration_scheduler()
+    stop_audits()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="rev_analyzer API", version="0.0.1")
+    app = FastAPI(title="rev_analyzer API", version="0.0.1", lifespan=lifespan)
     app.include_router(router)    
     return app
 
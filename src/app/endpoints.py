@@ -1,10 +1,21 @@
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import Any, Callable, Hashable
+
+from fastapi import APIRouter, HTTPException, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 
 from services.classify import classify
 from services.models.llm import predict as llm_predict
-from services.telemetry import get_user_data_service, get_product_info_service
-from app.requests import ReviewRequest, ReviewBatchResponse, UserDataResponse, ProductInfoResponse
+from services.telemetry import (
+    get_user_data_service, get_product_info_service,
+    get_user_data_version, get_product_info_version, user_data_etag, product_info_etag,
+)
+from services.calibration import refit_calibrator
+from services.cache import CACHE_TTL, CacheEntry, TTLCache, etag_matches, user_data_cache, product_info_cache
+from app.requests import (
+    ReviewRequest, ReviewBatchResponse, UserDataResponse, ProductInfoResponse,
+    CalibratorRefitRequest, CalibratorRefitResponse,
+)
 
 _log = logging.getLogger(__name__)
 router = APIRouter()
@@ -19,7 +30,9 @@ async def health_check():
 async def classify_review(request: ReviewRequest):
     
     try:
-        result = classify(
+        # classify blocks on model inference and LLM calls, keep it off the event loop
+        result = await run_in_threadpool(
+            classify,
             user_texts=request.texts,
             threshold=request.threshold,
             product_id=request.product_id,
@@ -32,25 +45,93 @@ async def classify_review(request: ReviewRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _cache_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = f"private, max-age={CACHE_TTL}"
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    _cache_headers(response, etag)
+    return response
+
+
+def _read_through(cache: TTLCache, key: Hashable, if_none_match: str | None,
+    version_etag: Callable[[], str], load: Callable[[], Any],
+    value_etag: Callable[[Any], str]) -> CacheEntry | Response:
+    """
+    Serve from cache, else compare ETag of stored data before loading,
+    so unchanged data gets 304 without building LLM summaries.
+    """
+    entry = cache.get(key)
+    etag = entry.etag if entry else version_etag()
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    return entry or cache.get_or_load(key, load, value_etag)
+
+
 @router.get("/get_user_data", response_model=UserDataResponse)
-async def get_user_data(user_id: str):
+async def get_user_data(
+    user_id: str,
+    response: Response,
+    cursor: str | None = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Reviews per page"),
+    include_text: bool = Query(True, description="Include review texts"),
+    if_none_match: str | None = Header(None),
+):
     try:
-        data = get_user_data_service(user_id)
-        return UserDataResponse(**data)
+        result = _read_through(
+            user_data_cache,
+            (user_id, cursor, limit, include_text),
+            if_none_match,
+            lambda: user_data_etag(get_user_data_version(user_id), cursor, limit, include_text),
+            lambda: get_user_data_service(user_id, cursor, limit, include_text),
+            lambda value: user_data_etag(value["user"], cursor, limit, include_text),
+        )
     except KeyError:
         raise HTTPException(status_code=404, detail="User not found")
     except Exception as e:
         _log.error(f"Error fetching user data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    if isinstance(result, Response):
+        return result
+    _cache_headers(response, result.etag)
+    return UserDataResponse(**result.value)
+
 
 @router.get("/get_product_info", response_model=ProductInfoResponse)
-async def get_product_info(product_id: str):
+async def get_product_info(
+    product_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+):
     try:
-        data = get_product_info_service(product_id)
-        return ProductInfoResponse(**data)
+        result = _read_through(
+            product_info_cache,
+            (product_id,),
+            if_none_match,
+            lambda: product_info_etag(get_product_info_version(product_id)),
+            lambda: get_product_info_service(product_id),
+            lambda value: product_info_etag(value["product"]),
+        )
     except KeyError:
         raise HTTPException(status_code=404, detail="Product not found")
     except Exception as e:
         _log.error(f"Error fetching product info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    if isinstance(result, Response):
+        return result
+    _cache_headers(response, result.etag)
+    return ProductInfoResponse(**result.value)
+
+
+@router.post("/refit_calibrator", response_model=CalibratorRefitResponse)
+async def refit_calibrator_endpoint(request: CalibratorRefitRequest):
+    try:
+        result = await run_in_threadpool(refit_calibrator, request.method)
+        return CalibratorRefitResponse(**result)
+    except Exception as e:
+        _log.error(f"Error refitting calibrator: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
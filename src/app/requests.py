@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 
 class ReviewRequest(BaseModel):
@@ -44,12 +44,28 @@ class ReviewBatchResponse(BaseModel):
 
 
 class UserDataResponse(BaseModel):
-    """User data with generated brief portrait"""
+    """User data with one page of reviews and generated brief portrait"""
     user: dict[str, Any]
     llm_summary: str
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page of reviews, null on the last page")
 
 
 class ProductInfoResponse(BaseModel):
     """Product data with generated brief description"""
     product: Dict[str, Any]
     llm_summary: str
+
+
+class CalibratorRefitRequest(BaseModel):
+    """Request model for manual calibrator refit"""
+    method: Literal["isotonic", "logistic"] = Field(
+        "isotonic",
+        description="Calibration method",
+        example="isotonic",
+    )
+
+
+class CalibratorRefitResponse(BaseModel):
+    """Calibrator refit outcome"""
+    refitted: bool = Field(..., description="Whether a new calibrator was fitted and swapped in")
+    samples: int = Field(..., description="Number of weak-labeled samples used", example=500)
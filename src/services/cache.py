@@ -0,0 +1,125 @@
+import os
+import json
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+CACHE_TTL = int(os.environ.get("CACHE_TTL", "60"))
+CACHE_MAX_SIZE = int(os.environ.get("CACHE_MAX_SIZE", "1024"))
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: Any
+    etag: str | None
+    expires_at: float
+
+
+def compute_etag(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str).encode()
+    return f'"{hashlib.sha1(payload).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check `If-None-Match` header value (may be a list or `*`) against an ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry expiration and optional ETags."""
+
+    def __init__(self, ttl: int = CACHE_TTL, max_size: int = CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: dict[Hashable, CacheEntry] = {}
+        # keys with loads in flight -> number of such loads
+        self._loading: dict[Hashable, int] = {}
+        # loading keys -> invalidation count, a load started before an invalidation isn't stored
+        self._generations: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry
+
+    def set(self, key: Hashable, value: Any, etag: str | None = None) -> CacheEntry:
+        entry = CacheEntry(value, etag, time.monotonic() + self.ttl)
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+        etag: Callable[[Any], str] | None = None) -> CacheEntry:
+        """
+        Return cached entry or load and cache it; `etag` derives the entry ETag from the value.
+        Value loaded concurrently with an `invalidate` of its key is returned but not cached.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            self._loading[key] = self._loading.get(key, 0) + 1
+            generation = self._generations.get(key, 0)
+        try:
+            value = loader()
+            entry = CacheEntry(value, etag(value) if etag else None, time.monotonic() + self.ttl)
+        except Exception:
+            with self._lock:
+                self._finish_load(key)
+            raise
+
+        with self._lock:
+            if self._finish_load(key) == generation:
+                self._store(key, entry)
+        return entry
+
+    def invalidate(self, match: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [k for k in self._entries if match(k)]:
+                del self._entries[key]
+            for key in self._loading:
+                if match(key):
+                    self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _finish_load(self, key: Hashable) -> int:
+        generation = self._generations.get(key, 0)
+        self._loading[key] -= 1
+        if not self._loading[key]:
+            del self._loading[key]
+            self._generations.pop(key, None)
+        return generation
+
+    def _store(self, key: Hashable, entry: CacheEntry):
+        if key not in self._entries and len(self._entries) >= self.max_size:
+            self._evict()
+        self._entries[key] = entry
+
+    def _evict(self):
+        # drop expired entries first, then the oldest inserted one
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+
+# keys are tuples starting with user_id / product_id
+user_data_cache = TTLCache()
+# portrait depends only on user_id, shared by every page/variant of user data
+user_portrait_cache = TTLCache()
+product_info_cache = TTLCache()
@@ -0,0 +1,164 @@
+import os
+import random
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from services.db import get_calibration_collection
+from services.models import domain_model
+from services.models.llm import predict as llm_predict
+
+_log = logging.getLogger(__name__)
+
+CALIBRATION_METHODS = ("isotonic", "logistic")
+CALIBRATION_METHOD = os.environ.get("CALIBRATION_METHOD", "isotonic")
+if CALIBRATION_METHOD not in CALIBRATION_METHODS:
+    raise ValueError(f"CALIBRATION_METHOD must be one of {CALIBRATION_METHODS}, got '{CALIBRATION_METHOD}'")
+# seconds between scheduled refits, 0 disables the scheduler
+CALIBRATION_REFIT_INTERVAL = int(os.environ.get("CALIBRATION_REFIT_INTERVAL", "3600"))
+CALIBRATION_MIN_SAMPLES = int(os.environ.get("CALIBRATION_MIN_SAMPLES", "100"))
+CALIBRATION_MAX_SAMPLES = int(os.environ.get("CALIBRATION_MAX_SAMPLES", "10000"))
+# fraction of non-escalated reviews also graded by the LLM, so samples aren't
+# limited to the low-confidence range that escalation selects
+CALIBRATION_AUDIT_RATE = float(os.environ.get("CALIBRATION_AUDIT_RATE", "0.05"))
+# audits are graded in the background; beyond this many pending ones new audits are dropped
+CALIBRATION_AUDIT_QUEUE_SIZE = int(os.environ.get("CALIBRATION_AUDIT_QUEUE_SIZE", "100"))
+# raw-probability range [0, 1] is split into this many bins, each must hold
+# at least CALIBRATION_MIN_BIN_SAMPLES samples for a refit
+CALIBRATION_COVERAGE_BINS = int(os.environ.get("CALIBRATION_COVERAGE_BINS", "5"))
+CALIBRATION_MIN_BIN_SAMPLES = int(os.environ.get("CALIBRATION_MIN_BIN_SAMPLES", "5"))
+# LLM grades above this are treated as positive weak labels
+POSITIVE_GRADE_THRESHOLD = 5
+
+_stop_event = threading.Event()
+_scheduler_thread: threading.Thread | None = None
+
+_audit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calibration-audit")
+_audit_slots = threading.BoundedSemaphore(CALIBRATION_AUDIT_QUEUE_SIZE)
+
+
+# ----------------- Sample collection -----------------
+def should_audit() -> bool:
+    """Pick a random share of non-escalated reviews for LLM audit."""
+    return random.random() < CALIBRATION_AUDIT_RATE
+
+
+def store_calibration_sample(raw_prob: float, llm_grade: int, source: str):
+    """
+    Store domain model raw probability with LLM grade as weak label.
+    `source` is either "escalation" or "audit".
+    Review text is not stored, refits only need the raw probability.
+    """
+    if not 1 <= llm_grade <= 10:
+        _log.warning(f"Skipping calibration sample with invalid LLM grade {llm_grade}")
+        return
+
+    result = get_calibration_collection().insert_one({
+        "raw_prob": float(raw_prob),
+        "llm_grade": int(llm_grade),
+        "label": int(llm_grade > POSITIVE_GRADE_THRESHOLD),
+        "source": source,
+        "ensemble": domain_model.ENSEMBLE_ID,
+        "created_at": datetime.now(timezone.utc),
+    })
+    if not result.acknowledged:
+        _log.error("Failed to store calibration sample")
+
+
+def _audit(text: str, raw_prob: float):
+    try:
+        grade, _, _ = llm_predict(text)
+        store_calibration_sample(raw_prob, grade, "audit")
+    except Exception:
+        _log.exception(f"LLM audit failed for text '{text[:50]}...'")
+
+
+def submit_audit(text: str, raw_prob: float) -> Future | None:
+    """
+    Queue LLM grading of a non-escalated review, off the request path.
+    Returns None when the audit queue is full and the audit is dropped.
+    """
+    if not _audit_slots.acquire(blocking=False):
+        _log.warning("Calibration audit queue is full, dropping audit")
+        return None
+    try:
+        future = _audit_executor.submit(_audit, text, float(raw_prob))
+    except RuntimeError:
+        # executor already shut down
+        _audit_slots.release()
+        return None
+    future.add_done_callback(lambda _: _audit_slots.release())
+    return future
+
+
+def stop_audits():
+    _audit_executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ----------------- Refit -----------------
+def refit_calibrator(method: str = CALIBRATION_METHOD) -> dict:
+    """
+    Refit calibrator on the latest stored samples of the current ensemble.
+    Fits on stored raw probabilities, so no model inference happens during a refit.
+    Refuses to fit when samples don't cover the whole raw-probability range,
+    a clipped isotonic fit would otherwise flatten the uncovered part.
+    """
+    samples = list(
+        get_calibration_collection()
+        .find({"ensemble": domain_model.ENSEMBLE_ID}, {"_id": 0, "raw_prob": 1, "label": 1})
+        .sort("created_at", -1)
+        .limit(CALIBRATION_MAX_SAMPLES)
+    )
+    if len(samples) < CALIBRATION_MIN_SAMPLES:
+        _log.info(f"Not enough calibration samples ({len(samples)} < {CALIBRATION_MIN_SAMPLES}), skipping refit")
+        return {"refitted": False, "samples": len(samples)}
+
+    raw_probs = np.array([s["raw_prob"] for s in samples], dtype=float)
+    labels = np.array([s["label"] for s in samples], dtype=int)
+    if len(np.unique(labels)) < 2:
+        _log.info("Calibration samples contain a single class, skipping refit")
+        return {"refitted": False, "samples": len(samples)}
+
+    bin_counts, _ = np.histogram(raw_probs, bins=CALIBRATION_COVERAGE_BINS, range=(0.0, 1.0))
+    if bin_counts.min() < CALIBRATION_MIN_BIN_SAMPLES:
+        _log.info(f"Calibration samples don't cover raw-probability range (bin counts {bin_counts.tolist()}), skipping refit")
+        return {"refitted": False, "samples": len(samples)}
+
+    domain_model.fit_calibrator(raw_probs, labels, method=method)
+    _log.info(f"Refitted {method} calibrator on {len(samples)} samples")
+    return {"refitted": True, "samples": len(samples)}
+
+
+# ----------------- Scheduler -----------------
+def _scheduler_loop(interval: int):
+    while not _stop_event.wait(interval):
+        try:
+            refit_calibrator()
+        except Exception:
+            _log.exception("Scheduled calibrator refit failed")
+
+
+def start_calibration_scheduler(interval: int = CALIBRATION_REFIT_INTERVAL):
+    global _scheduler_thread
+    if interval <= 0:
+        _log.info("Calibrator refit scheduler disabled")
+        return
+    if _scheduler_thread and _scheduler_thread.is_alive():
+        return
+
+    _stop_event.clear()
+    _scheduler_thread = threading.Thread(
+        target=_scheduler_loop, args=(interval,), name="calibrator-refit", daemon=True
+    )
+    _scheduler_thread.start()
+    _log.info(f"Calibrator refit scheduler started, interval={interval}s")
+
+
+def stop_calibration_scheduler():
+    _stop_event.set()
+    if _scheduler_thread:
+        # refits do no inference, so waiting for a running one is short
+        _scheduler_thread.join()
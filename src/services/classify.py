@@ -3,8 +3,9 @@ from typing import Any
 
 from services.models.llm import predict as llm_predict
 from services.models.domain_model import init_models
-from services.models.domain_model import predict as domain_model_predict
+from services.models.domain_model import predict_batch as domain_model_predict_batch
 from services.telemetry import store_user_data, store_product_data
+from services.calibration import store_calibration_sample, should_audit, submit_audit
 
 
 _log = logging.getLogger(__name__)
@@ -13,6 +14,14 @@ _log = logging.getLogger(__name__)
 init_models()
 
 
+def _collect_calibration_sample(raw_prob: float, grade: int, source: str):
+    # LLM grade is a weak label for calibrator refits; never fail classification on it
+    try:
+        store_calibration_sample(raw_prob, grade, source)
+    except Exception as e:
+        _log.error(f"Failed to store calibration sample: {e}")
+
+
 def classify(user_texts: dict[str, str], threshold: float | None,
     product_id: str | None, specified_provider: str | None):
     """Main classification method implementing hybrid inference pipeline"""
@@ -21,21 +30,28 @@ def classify(user_texts: dict[str, str], threshold: float | None,
 
     results: list[dict[str, Any]] = []
 
+    # Step 1: domain model, batched over all texts
+    grades, confidences, raw_probs = domain_model_predict_batch(list(user_texts.values()))
 
-    for user_id, text in user_texts.items():
+    for (user_id, text), grade, confidence, raw_prob in zip(user_texts.items(), grades, confidences, raw_probs):
         try:
-            # Step 1: domain model
-            grade, confidence = domain_model_predict(text)
+            grade, confidence = int(grade), float(confidence)
             tags = []
 
             # Step 2: escalate if needed
             if confidence < threshold if threshold else 0.6:
                 _log.info(f"Escalated to LLM for text: '{text[:50]}...'")
-                grade, confidence, tags = llm_predict(text, specified_provider)
-                
+                grade, confidence, tags = llm_predict(text)
+                _collect_calibration_sample(raw_prob, grade, "escalation")
+
             else:
                 _log.info(f"Domain model handled text: '{text[:50]}...'")
 
+                # audit a random share of confident reviews in the background,
+                # response keeps domain model result
+                if should_audit():
+                    submit_audit(text, raw_prob)
+
             results.append({
                 "text": text,
                 "grade": grade,
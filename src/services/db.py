@@ -7,6 +7,7 @@ MONGO_CONNECTION = os.environ.get("MONGO_CONNECTION", "mongodb://localhost:27017
 DB_NAME = os.environ.get("DB_NAME", "rev_analyzer")
 USERS_COLLECTION_NAME = os.environ.get("USERS_COLLECTION_NAME", "users")
 PRODUCTS_COLLECTION_NAME = os.environ.get("USERS_COLLECTION_NAME", "products")
+CALIBRATION_COLLECTION_NAME = os.environ.get("CALIBRATION_COLLECTION_NAME", "calibration_samples")
 
 _log = logging.getLogger(__name__)
 
@@ -31,4 +32,7 @@ def get_users_collection():
 def get_products_collection():
     return get_collection(PRODUCTS_COLLECTION_NAME)
 
+def get_calibration_collection():
+    return get_collection(CALIBRATION_COLLECTION_NAME)
+
 
@@ -1,6 +1,8 @@
 # domain_model.py
 import logging
+import os
 import re
+import threading
 from typing import List, Tuple
 
 import numpy as np
@@ -16,13 +18,20 @@ MODEL_NAMES = [
     "cardiffnlp/twitter-roberta-base-sentiment",   # often 3-class
     "distilbert-base-uncased-finetuned-sst-2-english",  # 2-class
 ]
+# identifies the ensemble that produced stored raw probabilities; bump on any change to
+# MODEL_NAMES, their revisions or `_result_to_pos_prob`, so old calibration samples are ignored
+ENSEMBLE_VERSION = os.environ.get("ENSEMBLE_VERSION", "1")
+ENSEMBLE_ID = f"{'+'.join(MODEL_NAMES)}@v{ENSEMBLE_VERSION}"
 
 DEFAULT_TEMPERATURE = 1.5
-CALIBRATOR_PATH = "calibrator.joblib"
+CALIBRATOR_PATH = os.environ.get("CALIBRATOR_PATH", "calibrator.joblib")
+INFERENCE_BATCH_SIZE = int(os.environ.get("INFERENCE_BATCH_SIZE", "32"))
 
 # ----- globals -----
 _pipelines: List = []
 _calibrator = None
+# serializes fit/load/swap; readers just take a snapshot of `_calibrator`
+_calibrator_lock = threading.Lock()
 
 
 def init_models():
@@ -50,15 +59,7 @@ def init_models():
                 _log.exception(f"[domain_model] failed to load model {mn} — continuing with remaining models")
 
         # try to load calibrator, but don't crash if missing/bad
-        try:
-            _calibrator = joblib.load(CALIBRATOR_PATH)
-            _log.info(f"[domain_model] loaded calibrator from {CALIBRATOR_PATH}")
-        except FileNotFoundError:
-            _log.info(f"[domain_model] no calibrator file found at {CALIBRATOR_PATH} (ok)")
-            _calibrator = None
-        except Exception:
-            _log.exception(f"[domain_model] failed to load calibrator {CALIBRATOR_PATH} (ignored)")
-            _calibrator = None
+        load_calibrator()
 
     except Exception:
         # Very defensive: catch absolutely everything and log full traceback
@@ -67,6 +68,26 @@ def init_models():
         _calibrator = None
 
 
+def load_calibrator(path: str = CALIBRATOR_PATH):
+    """
+    Load calibrator from `path` and swap it in atomically.
+    On missing/bad file the currently active calibrator is kept.
+    """
+    global _calibrator
+    with _calibrator_lock:
+        try:
+            cal = joblib.load(path)
+        except FileNotFoundError:
+            _log.info(f"[domain_model] no calibrator file found at {path} (ok)")
+            return _calibrator
+        except Exception:
+            _log.exception(f"[domain_model] failed to load calibrator {path} (ignored)")
+            return _calibrator
+        _calibrator = cal
+    _log.info(f"[domain_model] loaded calibrator from {path}")
+    return cal
+
+
 def _result_to_pos_prob(res: dict) -> float:
     """
     Convert pipeline result to probability of positive sentiment in [0,1].
@@ -95,47 +116,66 @@ def _result_to_pos_prob(res: dict) -> float:
     return score
 
 
-def _ensemble_prob(text: str) -> float:
+def ensemble_probs(texts: List[str]) -> np.ndarray:
     """
-    Run all loaded pipelines and return mean positive-prob.
-    Safe: if no pipelines are loaded, return neutral 0.5.
+    Run all loaded pipelines over a batch of texts and return mean positive-prob per text.
+    Safe: if no pipelines are loaded, return neutral 0.5 for every text.
     """
+    if not texts:
+        return np.empty(0, dtype=float)
+
     probs = []
     for p in _pipelines:
         try:
-            r = p(text, truncation=True)[0]
-            probs.append(_result_to_pos_prob(r))
+            rs = p(list(texts), truncation=True, batch_size=INFERENCE_BATCH_SIZE)
+            probs.append([_result_to_pos_prob(r) for r in rs])
         except Exception:
             _log.exception("[domain_model] pipeline inference failed for one model (skipping)")
     if not probs:
         _log.warning("[domain_model] no pipelines available; returning neutral probability 0.5")
-        return 0.5
-    return float(np.mean(probs))
+        return np.full(len(texts), 0.5)
+    return np.mean(np.array(probs, dtype=float), axis=0)
 
 
-def _apply_calibrator(prob: float) -> float:
-    global _calibrator
-    if _calibrator is None:
-        return prob
+def _apply_calibrator(probs: np.ndarray) -> np.ndarray:
+    probs = np.asarray(probs, dtype=float)
+    # snapshot, so a concurrent hot swap can't change the calibrator mid-call
+    calibrator = _calibrator
+    if calibrator is None or probs.size == 0:
+        return probs
     try:
-        if hasattr(_calibrator, "predict_proba"):
-            return float(_calibrator.predict_proba(np.array([[prob]]))[:, 1][0])
-        return float(_calibrator.predict(np.array([prob]))[0])
+        if hasattr(calibrator, "predict_proba"):
+            return calibrator.predict_proba(probs.reshape(-1, 1))[:, 1]
+        return np.asarray(calibrator.predict(probs), dtype=float)
     except Exception:
         _log.exception("[domain_model] calibrator failed during application; ignoring calibrator")
-        return prob
+        return probs
 
 
-def _temp_scale(prob: float, T: float) -> float:
+def _temp_scale(probs: np.ndarray, T: float) -> np.ndarray:
     eps = 1e-6
-    p = float(np.clip(prob, eps, 1 - eps))
+    p = np.clip(np.asarray(probs, dtype=float), eps, 1 - eps)
     logit = np.log(p / (1.0 - p))
-    return float(1.0 / (1.0 + np.exp(-logit / float(T))))
+    return 1.0 / (1.0 + np.exp(-logit / float(T)))
 
 
-def _prob_to_grade(prob: float) -> int:
+def _prob_to_grade(probs: np.ndarray) -> np.ndarray:
     # linear mapping 0..1 -> 1..10
-    return int(round(1 + 9 * float(np.clip(prob, 0.0, 1.0))))
+    return np.rint(1 + 9 * np.clip(np.asarray(probs, dtype=float), 0.0, 1.0)).astype(int)
+
+
+def predict_batch(texts: List[str], temperature: float = DEFAULT_TEMPERATURE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batched predict: returns (grades, confidences, raw ensemble probs) arrays aligned with `texts`.
+    Raw probs are exposed so callers can collect calibration samples.
+    """
+    raw_probs = ensemble_probs(texts)
+    probs = _apply_calibrator(raw_probs)
+    if temperature and temperature != 1.0:
+        probs = _temp_scale(probs, temperature)
+    grades = _prob_to_grade(probs)
+    _log.info(f"[domain_model] batch prediction made for {len(texts)} texts")
+    return grades, probs, raw_probs
 
 
 def predict(text: str, temperature: float = DEFAULT_TEMPERATURE) -> Tuple[int, float]:
@@ -143,26 +183,32 @@ def predict(text: str, temperature: float = DEFAULT_TEMPERATURE) -> Tuple[int, f
     Public predict method: returns (grade:int 1..10, confidence:float 0..1).
     Never raises due to missing models; logs warnings and returns neutral fallback if needed.
     """
-    raw_prob = _ensemble_prob(text)
-    prob = _apply_calibrator(raw_prob)
-    if temperature and temperature != 1.0:
-        prob = _temp_scale(prob, temperature)
-    grade = _prob_to_grade(prob)
-    _log.info(f"[domain_model] prediction made: grade={grade}, prob={float(prob)}")
-    return grade, float(prob)
+    grades, probs, _ = predict_batch([text], temperature)
+    grade, prob = int(grades[0]), float(probs[0])
+    _log.info(f"[domain_model] prediction made: grade={grade}, prob={prob}")
+    return grade, prob
 
 
 
 def fit_calibrator(raw_probs: List[float], y_true: List[int], method: str = "isotonic"):
     """
-    Fit and persist a calibrator from a labeled set. Saves to CALIBRATOR_PATH.
+    Fit and persist a calibrator from a labeled set, then hot-swap it in.
+    The file at CALIBRATOR_PATH is replaced atomically, so readers never see a partial dump.
     """
-    X = np.array(raw_probs).reshape(-1, 1)
-    y = np.array(y_true).astype(int)
+    global _calibrator
+    X = np.asarray(raw_probs, dtype=float).reshape(-1, 1)
+    y = np.asarray(y_true).astype(int)
     if method == "isotonic":
-        cal = IsotonicRegression(out_of_bounds="clip").fit(raw_probs, y)
-    else:
+        cal = IsotonicRegression(out_of_bounds="clip").fit(X.ravel(), y)
+    elif method == "logistic":
         cal = LogisticRegression().fit(X, y)
-    joblib.dump(cal, CALIBRATOR_PATH)
-    _log.info(f"[domain_model] saved calibrator to {CALIBRATOR_PATH}")
+    else:
+        raise ValueError(f"Unknown calibration method '{method}'")
+
+    with _calibrator_lock:
+        tmp_path = f"{CALIBRATOR_PATH}.tmp"
+        joblib.dump(cal, tmp_path)
+        os.replace(tmp_path, CALIBRATOR_PATH)
+        _calibrator = cal
+    _log.info(f"[domain_model] saved calibrator to {CALIBRATOR_PATH} and swapped it in")
     return cal
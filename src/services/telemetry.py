@@ -2,9 +2,19 @@ import logging
 from datetime import datetime, timezone
 from services.db import get_users_collection, get_products_collection
 from services.models.llm import completion
+from services.cache import compute_etag, user_data_cache, user_portrait_cache, product_info_cache
 
 _log = logging.getLogger(__name__)
 
+PORTRAIT_TEXTS_LIMIT = 10
+SUMMARY_TEXTS_LIMIT = 20
+
+USER_FIELDS = {"user_id": 1, "first_review_date": 1, "last_review_date": 1}
+# stored fields that change on every write, ETags are derived from them instead of
+# the payload, which holds non-deterministic LLM summaries
+USER_VERSION_FIELDS = ("last_review_date",)
+PRODUCT_VERSION_FIELDS = ("grade_count", "average_grade", "tags_counts")
+
 
 # ----------------- DB Storage -----------------
 def store_user_data(user_id: str, product_id: str, grade: float, text: str):
@@ -29,6 +39,10 @@ def store_user_data(user_id: str, product_id: str, grade: float, text: str):
     if not result.acknowledged:
         _log.error(f"Failed to update user {user_id} with review for {product_id}")
 
+    user_data_cache.invalidate(lambda key: key[0] == user_id)
+    user_portrait_cache.invalidate(lambda key: key[0] == user_id)
+    product_info_cache.invalidate(lambda key: key[0] == product_id)
+
 
 def store_product_data(product_id: str):
     users = get_users_collection()
@@ -64,6 +78,8 @@ def store_product_data(product_id: str):
     if not result.acknowledged:
         _log.error(f"Failed to update product {product_id} with stats")
 
+    product_info_cache.invalidate(lambda key: key[0] == product_id)
+
 
 # ----------------- LLM Summarization -----------------
 def _run_summary(prompt: str) -> str | None:
@@ -76,14 +92,12 @@ def _run_summary(prompt: str) -> str | None:
         "- If the provided content is empty or insufficient, return exactly 'NONE'.\n\n"
         f"{prompt}"
     )
-    result = completion(final_prompt, schema=None)
+    result = completion(final_prompt, format=None)
     text = str(result).strip()
     return None if text.upper() == "NONE" else text
 
 
-def build_user_portrait(user: dict) -> str | None:
-    reviews = user.get("reviews", {})
-    texts = [v.get("text", "") for v in reviews.values() if v.get("text")]
+def build_user_portrait(texts: list[str]) -> str | None:
     if not texts:
         return None
 
@@ -91,7 +105,7 @@ def build_user_portrait(user: dict) -> str | None:
         "Given the following product reviews by the same user, "
         "write a short, neutral portrait of their preferences and style. "
         "Keep under 60 words.\n\n"
-        + "\n".join(texts[:10])
+        + "\n".join(texts[:PORTRAIT_TEXTS_LIMIT])
     )
     return _run_summary(prompt)
 
@@ -102,17 +116,11 @@ def build_product_summary(product: dict) -> str | None:
         return None
 
     users_cur = get_users_collection().find(
-        {f"reviews.{pid}": {"$exists": True}}, {f"reviews.{pid}": 1}
-    )
-
-    texts: list[str] = []
-    for u in users_cur:
-        review = u.get("reviews", {}).get(pid)
-        if isinstance(review, dict):
-            t = review.get("text")
-            if t:
-                texts.append(t)
+        {f"reviews.{pid}.text": {"$nin": [None, ""]}},
+        {"_id": 0, f"reviews.{pid}.text": 1},
+    ).limit(SUMMARY_TEXTS_LIMIT)
 
+    texts = [u["reviews"][pid]["text"] for u in users_cur]
     if not texts:
         return None
 
@@ -121,21 +129,116 @@ def build_product_summary(product: dict) -> str | None:
         "Summarize perceived qualities of the product using user reviews and tag counts. "
         "Write a concise, neutral summary under 60 words.\n\n"
         f"Tags (counts): {tag_counts}\n\n"
-        + "\n".join(texts[:20])
+        + "\n".join(texts)
     )
     return _run_summary(prompt)
 
 
+# ----------------- Queries -----------------
+def _user_reviews_array():
+    return {"$objectToArray": {"$ifNull": ["$reviews", {}]}}
+
+
+def _fetch_user_page(user_id: str, cursor: str | None, limit: int, include_text: bool) -> dict | None:
+    """
+    Fetch user fields with one page of reviews, ordered by product_id.
+    `cursor` is the last product_id of the previous page; one extra review is
+    fetched to tell whether there is a next page.
+    """
+    reviews = _user_reviews_array()
+    if cursor:
+        reviews = {"$filter": {"input": reviews, "as": "r", "cond": {"$gt": ["$$r.k", cursor]}}}
+
+    review_fields = {"product_id": "$$r.k", "grade": "$$r.v.grade"}
+    if include_text:
+        review_fields["text"] = "$$r.v.text"
+
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$limit": 1},
+        {"$project": {
+            **USER_FIELDS,
+            "review_count": {"$size": _user_reviews_array()},
+            "reviews": {"$map": {
+                "input": {"$slice": [{"$sortArray": {"input": reviews, "sortBy": {"k": 1}}}, limit + 1]},
+                "as": "r",
+                "in": review_fields,
+            }},
+        }},
+    ]
+    return next(get_users_collection().aggregate(pipeline), None)
+
+
+def _fetch_user_texts(user_id: str, limit: int) -> list[str]:
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$limit": 1},
+        {"$project": {"_id": 0, "texts": {"$slice": [
+            {"$filter": {
+                "input": {"$map": {"input": _user_reviews_array(), "as": "r", "in": "$$r.v.text"}},
+                "as": "t",
+                # null and missing texts sort before ""
+                "cond": {"$gt": ["$$t", ""]},
+            }},
+            limit,
+        ]}}},
+    ]
+    doc = next(get_users_collection().aggregate(pipeline), None)
+    return doc["texts"] if doc else []
+
+
+# ----------------- ETags -----------------
+def user_data_etag(user: dict, cursor: str | None, limit: int, include_text: bool) -> str:
+    version = {f: user.get(f) for f in USER_VERSION_FIELDS}
+    return compute_etag([version, cursor, limit, include_text])
+
+
+def product_info_etag(product: dict) -> str:
+    return compute_etag({f: product.get(f) for f in PRODUCT_VERSION_FIELDS})
+
+
+def get_user_data_version(user_id: str) -> dict:
+    """Fetch only the fields `user_data_etag` depends on."""
+    user = get_users_collection().find_one(
+        {"user_id": user_id}, {"_id": 0, **{f: 1 for f in USER_VERSION_FIELDS}}
+    )
+    if not user:
+        raise KeyError(f"User {user_id} not found")
+    return user
+
+
+def get_product_info_version(product_id: str) -> dict:
+    """Fetch only the fields `product_info_etag` depends on."""
+    product = get_products_collection().find_one(
+        {"product_id": product_id}, {"_id": 0, **{f: 1 for f in PRODUCT_VERSION_FIELDS}}
+    )
+    if not product:
+        raise KeyError(f"Product {product_id} not found")
+    return product
+
+
 # ----------------- Services -----------------
-def get_user_data_service(user_id: str) -> dict:
-    user = get_users_collection().find_one({"user_id": user_id})
+def get_user_data_service(user_id: str, cursor: str | None = None, limit: int = 20,
+    include_text: bool = True) -> dict:
+    user = _fetch_user_page(user_id, cursor, limit, include_text)
     if not user:
         raise KeyError(f"User {user_id} not found")
 
-    summary = build_user_portrait(user)
+    reviews = user["reviews"]
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        next_cursor = reviews[-1]["product_id"]
+    # keyed by product_id, as stored
+    user["reviews"] = {r["product_id"]: r for r in reviews}
+
+    summary = user_portrait_cache.get_or_load(
+        (user_id,),
+        lambda: build_user_portrait(_fetch_user_texts(user_id, PORTRAIT_TEXTS_LIMIT)),
+    ).value
     if "_id" in user:
         user["_id"] = str(user["_id"])
-    return {"user": user, "llm_summary": summary}
+    return {"user": user, "llm_summary": summary, "next_cursor": next_cursor}
 
 
 def get_product_info_service(product_id: str) -> dict:
@@ -0,0 +1,19 @@
+from services.models import domain_model
+
+# `services.classify` initializes models on import; keep tests from downloading them
+domain_model.MODEL_NAMES = []
+
+
+class FakeInsertResult:
+    acknowledged = True
+
+
+class FakeCollection:
+    """Minimal in-memory stand-in for a pymongo collection."""
+
+    def __init__(self, docs: list[dict] | None = None):
+        self.docs = docs or []
+
+    def insert_one(self, doc: dict):
+        self.docs.append(doc)
+        return FakeInsertResult()
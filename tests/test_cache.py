@@ -0,0 +1,36 @@
+from services.cache import TTLCache, etag_matches
+
+
+def test_get_or_load_caches_value_with_etag():
+    cache = TTLCache()
+    loads = []
+
+    first = cache.get_or_load(("user_1",), lambda: loads.append(1) or {"a": 1}, lambda value: '"v1"')
+    second = cache.get_or_load(("user_1",), lambda: loads.append(1) or {"a": 2}, lambda value: '"v2"')
+
+    assert len(loads) == 1
+    assert second.value == {"a": 1}
+    assert second.etag == first.etag == '"v1"'
+
+
+def test_invalidation_during_load_is_not_overwritten():
+    cache = TTLCache()
+
+    def loader():
+        # a write lands between the loader's read and the cache store
+        cache.invalidate(lambda key: key[0] == "user_1")
+        return "stale"
+
+    entry = cache.get_or_load(("user_1",), loader)
+
+    assert entry.value == "stale"
+    assert cache.get(("user_1",)) is None
+    assert cache.get_or_load(("user_1",), lambda: "fresh").value == "fresh"
+    assert cache.get(("user_1",)).value == "fresh"
+
+
+def test_etag_matches():
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"def"', '"abc"')
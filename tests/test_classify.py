@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from services import calibration
+from services import classify as classify_module
+from conftest import FakeCollection
+
+
+@pytest.fixture
+def samples(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(calibration, "get_calibration_collection", lambda: collection)
+    monkeypatch.setattr(classify_module, "store_user_data", lambda *args: None)
+    monkeypatch.setattr(classify_module, "store_product_data", lambda *args: None)
+    return collection
+
+
+def _domain_model(grade: int, confidence: float, raw_prob: float):
+    return lambda texts: (np.array([grade]), np.array([confidence]), np.array([raw_prob]))
+
+
+def test_escalated_review_stores_calibration_sample(monkeypatch, samples):
+    monkeypatch.setattr(classify_module, "domain_model_predict_batch", _domain_model(5, 0.4, 0.3))
+    monkeypatch.setattr(classify_module, "llm_predict", lambda text: (2, 0.9, ["broken"]))
+
+    result = classify_module.classify({"user_1": "Broke after a day"}, 0.7, "laptop_1", "ollama")
+
+    assert result["results"][0]["grade"] == 2
+    assert result["results"][0]["tags"] == ["broken"]
+    assert len(samples.docs) == 1
+    sample = samples.docs[0]
+    assert sample["raw_prob"] == pytest.approx(0.3)
+    assert sample["llm_grade"] == 2
+    assert sample["label"] == 0
+    assert sample["source"] == "escalation"
+    assert sample["ensemble"] == calibration.domain_model.ENSEMBLE_ID
+    assert "text" not in sample
+
+
+def test_confident_review_is_audited_in_background(monkeypatch, samples):
+    audits = []
+    monkeypatch.setattr(classify_module, "domain_model_predict_batch", _domain_model(9, 0.95, 0.9))
+    monkeypatch.setattr(classify_module, "should_audit", lambda: True)
+    monkeypatch.setattr(classify_module, "submit_audit", lambda text, raw_prob: audits.append((text, raw_prob)))
+    monkeypatch.setattr(classify_module, "llm_predict", lambda text: pytest.fail("LLM called on request path"))
+
+    result = classify_module.classify({"user_1": "Love it"}, 0.7, "laptop_1", "ollama")
+
+    assert result["results"][0]["grade"] == 9
+    assert audits == [("Love it", pytest.approx(0.9))]
+    assert samples.docs == []
+
+
+def test_audit_stores_calibration_sample(monkeypatch, samples):
+    monkeypatch.setattr(calibration, "llm_predict", lambda text: (8, 0.8, []))
+
+    calibration.submit_audit("Love it", 0.9).result(timeout=5)
+
+    assert len(samples.docs) == 1
+    assert samples.docs[0]["source"] == "audit"
+    assert samples.docs[0]["label"] == 1
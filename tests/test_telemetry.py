@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+
+from services import telemetry
+from services.cache import TTLCache
+
+
+class FakeUsersCollection:
+    """Evaluates the user page and texts pipelines of `telemetry` against one stored user."""
+
+    def __init__(self, user: dict):
+        self.user = user
+
+    def aggregate(self, pipeline: list[dict]):
+        if pipeline[0]["$match"]["user_id"] != self.user["user_id"]:
+            return iter([])
+
+        project = pipeline[-1]["$project"]
+        reviews = sorted(self.user["reviews"].items())
+        if "texts" in project:
+            limit = project["texts"]["$slice"][1]
+            return iter([{"texts": [v["text"] for _, v in reviews if v.get("text")][:limit]}])
+
+        page = project["reviews"]["$map"]
+        sorted_reviews, limit = page["input"]["$slice"]
+        source = sorted_reviews["$sortArray"]["input"]
+        if "$filter" in source:
+            cursor = source["$filter"]["cond"]["$gt"][1]
+            reviews = [(k, v) for k, v in reviews if k > cursor]
+
+        items = []
+        for k, v in reviews[:limit]:
+            item = {"product_id": k, "grade": v["grade"]}
+            if "text" in page["in"]:
+                item["text"] = v["text"]
+            items.append(item)
+        return iter([{
+            "_id": "object_id",
+            "user_id": self.user["user_id"],
+            "last_review_date": self.user["last_review_date"],
+            "review_count": len(self.user["reviews"]),
+            "reviews": items,
+        }])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    prompts = []
+
+    def completion(prompt: str, format: dict | None = None):
+        prompts.append(prompt)
+        return "Enjoys reliable electronics"
+
+    user = {
+        "user_id": "user_1",
+        "last_review_date": datetime(2025, 1, 1),
+        "reviews": {
+            f"product_{i}": {"product_id": f"product_{i}", "grade": i + 1, "text": f"review {i}"}
+            for i in range(5)
+        },
+    }
+    monkeypatch.setattr(telemetry, "get_users_collection", lambda: FakeUsersCollection(user))
+    monkeypatch.setattr(telemetry, "completion", completion)
+    monkeypatch.setattr(telemetry, "user_portrait_cache", TTLCache())
+    return prompts
+
+
+def test_user_data_pages_follow_cursor(completions):
+    pages = []
+    cursor = None
+    while True:
+        data = telemetry.get_user_data_service("user_1", cursor=cursor, limit=2)
+        pages.append(list(data["user"]["reviews"]))
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == [["product_0", "product_1"], ["product_2", "product_3"], ["product_4"]]
+    assert data["user"]["review_count"] == 5
+    assert data["user"]["_id"] == "object_id"
+    assert data["llm_summary"] == "Enjoys reliable electronics"
+    # portrait is built once and shared by all pages
+    assert len(completions) == 1
+
+
+def test_user_data_without_texts(completions):
+    data = telemetry.get_user_data_service("user_1", limit=10, include_text=False)
+
+    assert data["next_cursor"] is None
+    assert data["user"]["reviews"]["product_0"] == {"product_id": "product_0", "grade": 1}
+
+
+def test_user_data_unknown_user(completions):
+    with pytest.raises(KeyError):
+        telemetry.get_user_data_service("user_2")